@@ -1,25 +1,54 @@
 import os
-import pandas as pd
-from flask import Flask, render_template, request, jsonify, send_file
+import orjson
+from flask import Flask, Response, render_template, request, jsonify, send_file
+from flask.json.provider import JSONProvider
 from dotenv import load_dotenv
+from flask_sock import Sock
+from simple_websocket import ConnectionClosed
 from deepgram import (
     DeepgramClient,
-    SpeakOptions,
-    PrerecordedOptions,
-    FileSource,
-    SpeakResponse,
-    PrerecordedResponse
+    LiveOptions,
+    LiveTranscriptionEvents
 )
-import io
+import httpx
+import collections
+import datetime
+import functools
+import hashlib
 import logging
+import math
+import re
+import threading
+import time
+import uuid
 import asyncio
+from dataclasses import dataclass, field
 
-# For Gemini
-import google.generativeai as genai
+# pyarrow is imported inside load_data() and google.generativeai inside
+# get_genai(): both are heavy imports that would otherwise sit on every
+# worker's cold-start path.
 
 load_dotenv()
 
+class OrjsonProvider(JSONProvider):
+    """Back Flask's JSON handling with orjson.
+
+    request.get_json() and jsonify() sit on the critical path of every
+    /initiate_call and error response; orjson parses and serializes these
+    small payloads several times faster than stdlib json with fewer transient
+    allocations.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+sock = Sock(app)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -34,46 +63,117 @@ except Exception as e:
     logger.error(f"Failed to initialize Deepgram client: {e}")
     raise
 
+# The SDK builds a fresh httpx session per REST call, so every STT and TTS
+# request would pay a new TCP+TLS handshake (~100-300ms). The two hot REST
+# paths bypass the SDK transport and POST through this one keep-alive pool
+# instead; the SDK is still used for the live STT websocket.
+DEEPGRAM_API_BASE = "https://api.deepgram.com/v1"
+dg_http = httpx.Client(
+    headers={"Authorization": f"Token {DEEPGRAM_API_KEY}"},
+    timeout=httpx.Timeout(30.0, connect=10.0),
+)
+
 # --- Google Gemini Client Initialization ---
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-GEMINI_MODEL_NAME = "gemini-1.5-flash-latest"  # Or "gemini-1.0-pro-latest", "gemini-1.5-pro-latest" etc.
-gemini_configured = False
+# The lite flash variant roughly halves prefill+decode time on these short
+# scripted collections turns; override via GEMINI_MODEL for A/B testing.
+GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite")
+gemini_configured = bool(GEMINI_API_KEY)
 if not GEMINI_API_KEY:
     logger.warning("GEMINI_API_KEY not found in environment variables. LLM features will use mock responses.")
-else:
-    try:
-        genai.configure(api_key=GEMINI_API_KEY)
-        gemini_configured = True
-        logger.info(f"Google Gemini client configured successfully for model {GEMINI_MODEL_NAME}.")
-    except Exception as e:
-        logger.error(f"Failed to configure Google Gemini client: {e}. LLM features may be disabled or mocked.")
-        gemini_configured = False
+
+_genai = None
+_genai_lock = threading.Lock()
+
+
+def get_genai():
+    """Import and configure google.generativeai on first use.
+
+    The Gemini SDK (and its grpc/proto dependency tree) is one of the slowest
+    imports in the app; deferring it keeps worker cold start fast. Returns the
+    configured module, or None when LLM features are unavailable (no API key
+    or configuration failure) and mock responses should be used.
+    """
+    global _genai, gemini_configured
+    if not gemini_configured:
+        return None
+    if _genai is None:
+        with _genai_lock:
+            if _genai is None:
+                try:
+                    import google.generativeai as genai
+                    genai.configure(api_key=GEMINI_API_KEY)
+                    _genai = genai
+                    logger.info(f"Google Gemini client configured successfully for model {GEMINI_MODEL_NAME}.")
+                except Exception as e:
+                    logger.error(
+                        f"Failed to configure Google Gemini client: {e}. LLM features may be disabled or mocked.")
+                    gemini_configured = False
+                    return None
+    return _genai
 
 # --- CSV Data Handling ---
 DATA_FILE = 'cleaned_data.csv'
-customer_df = None
+# Lookup dict keyed by normalized (stripped, lowercased) customer name, built once at
+# load time so per-request lookups are O(1) instead of a pandas column scan.
+customer_lookup = {}
 
 
 def load_data():
-    global customer_df
+    global customer_lookup
     try:
-        customer_df = pd.read_csv(DATA_FILE)
-        for col in ['Credit Score', 'Monthly Debt', 'Current Loan Amount', 'Random_Name']:
-            if col not in customer_df.columns:
-                customer_df[col] = None if col == 'Random_Name' else 0
-
-        customer_df['Credit Score'] = customer_df['Credit Score'].fillna(0)
-        customer_df['Monthly Debt'] = pd.to_numeric(customer_df['Monthly Debt'], errors='coerce').fillna(0)
-        customer_df['Current Loan Amount'] = pd.to_numeric(customer_df['Current Loan Amount'], errors='coerce').fillna(
-            0)
-        customer_df['Random_Name'] = customer_df['Random_Name'].astype(str).fillna("Unknown Customer")
-        logger.info("CSV data loaded successfully.")
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        # pyarrow parses the CSV in one typed pass (float32 numerics, a
+        # dictionary-encoded name column) instead of pandas' object columns
+        # plus fillna/to_numeric re-passes — faster cold start, smaller RSS.
+        # include_columns limits parsing to the four columns the bot uses; the
+        # CSV's other ~16 columns are never converted or held in memory.
+        convert_options = pa_csv.ConvertOptions(
+            include_columns=['Random_Name', 'Credit Score', 'Monthly Debt', 'Current Loan Amount'],
+            include_missing_columns=True,
+            column_types={
+                'Credit Score': pa.float32(),
+                'Monthly Debt': pa.float32(),
+                'Current Loan Amount': pa.float32(),
+                'Random_Name': pa.dictionary(pa.int32(), pa.string()),
+            },
+            null_values=['', 'NA'],
+            strings_can_be_null=True
+        )
+        table = pa_csv.read_csv(DATA_FILE, convert_options=convert_options)
+
+        num_rows = table.num_rows
+        columns = {}
+        for col, default in (('Random_Name', "Unknown Customer"),
+                             ('Credit Score', 0.0),
+                             ('Monthly Debt', 0.0),
+                             ('Current Loan Amount', 0.0)):
+            if col in table.column_names:
+                columns[col] = [default if value is None else value
+                                for value in table.column(col).to_pylist()]
+            else:
+                columns[col] = [default] * num_rows
+
+        # setdefault keeps the *first* row for duplicated names, matching the
+        # original scan's iloc[0] semantics (the CSV has a handful of dupes).
+        customer_lookup = {}
+        for i in range(num_rows):
+            name = str(columns['Random_Name'][i])
+            customer_lookup.setdefault(name.strip().lower(), {
+                'Random_Name': name,
+                'Credit Score': columns['Credit Score'][i],
+                'Monthly Debt': columns['Monthly Debt'][i],
+                'Current Loan Amount': columns['Current Loan Amount'][i],
+            })
+        logger.info(f"CSV data loaded successfully ({len(customer_lookup)} customers indexed).")
     except FileNotFoundError:
         logger.error(f"Error: The file {DATA_FILE} was not found.")
-        customer_df = pd.DataFrame(columns=['Random_Name', 'Credit Score', 'Monthly Debt', 'Current Loan Amount'])
+        customer_lookup = {}
     except Exception as e:
         logger.error(f"Error loading or processing CSV: {e}")
-        customer_df = pd.DataFrame(columns=['Random_Name', 'Credit Score', 'Monthly Debt', 'Current Loan Amount'])
+        customer_lookup = {}
 
 
 load_data()
@@ -120,21 +220,77 @@ You are LoanMate, an advanced AI collections agent for Global Finance Solutions.
 """
 UNKNOWN_CUSTOMER_PLACEHOLDER = "the customer (name not yet identified)"
 
-active_call_data = {
-    "customer_info": None,
-    "conversation_history": [],
-    "asked_for_name_in_last_turn": False
-}
+# --- Per-call session state ---
+# Each call gets its own CallState keyed by a UUID issued at /initiate_call
+# (previously a single module-level dict, which meant two simultaneous callers
+# corrupted each other's conversation). Entries expire after CALL_TTL_SECONDS
+# of inactivity and the store is capped so memory stays bounded.
+CALL_TTL_SECONDS = 600
+MAX_ACTIVE_CALLS = 10_000
+MAX_HISTORY_TURNS = 10
+
+
+def _new_history():
+    # deque(maxlen=...) trims itself on append, so no per-turn reslicing.
+    return collections.deque(maxlen=MAX_HISTORY_TURNS * 2)
+
+
+@dataclass(slots=True)
+class CallState:
+    customer_info: dict = None
+    conversation_history: collections.deque = field(default_factory=_new_history)
+    asked_for_name_in_last_turn: bool = False
+    system_prompt: str = None
+    gemini_cache: object = None
+    gemini_cache_prompt: str = None
+    gemini_cache_expiry: float = 0.0
+    semantic_cache: collections.OrderedDict = field(default_factory=collections.OrderedDict)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+calls = {}
+calls_lock = threading.Lock()
+
+
+def _evict_stale_calls():
+    # Caller must hold calls_lock.
+    now = time.monotonic()
+    expired = [call_id for call_id, state in calls.items()
+               if now - state.last_used > CALL_TTL_SECONDS]
+    for call_id in expired:
+        del calls[call_id]
+    while len(calls) > MAX_ACTIVE_CALLS:
+        oldest = min(calls, key=lambda call_id: calls[call_id].last_used)
+        del calls[oldest]
+
+
+def create_call_state():
+    call_id = uuid.uuid4().hex
+    state = CallState()
+    with calls_lock:
+        _evict_stale_calls()
+        calls[call_id] = state
+    return call_id, state
+
+
+def get_call_state(call_id):
+    if not call_id:
+        return None
+    with calls_lock:
+        state = calls.get(call_id)
+        if state is not None:
+            state.last_used = time.monotonic()
+    return state
 
 
 # --- Helper functions ---
 def get_customer_details(name):
-    if customer_df is None or customer_df.empty:
-        logger.warning("customer_df is not loaded or is empty in get_customer_details.")
+    if not customer_lookup:
+        logger.warning("customer_lookup is not loaded or is empty in get_customer_details.")
         return None
-    customer_data = customer_df[customer_df['Random_Name'].str.strip().str.lower() == name.strip().lower()]
-    if not customer_data.empty:
-        return customer_data.iloc[0].to_dict()
+    customer_details = customer_lookup.get(name.strip().lower())
+    if customer_details is not None:
+        return customer_details
     logger.info(f"Customer '{name}' not found in CSV.")
     return None
 
@@ -146,6 +302,21 @@ def format_currency(amount):
         return str(amount) if amount else "N/A"
 
 
+@functools.lru_cache(maxsize=256)
+def _render_prompt(name, loan, emi, half_emi, score):
+    # The template is ~4KB; formatting it on every turn is wasted CPU since the
+    # values only change when a customer is (re)identified. Memoized on the
+    # already-stringified field values so repeat turns are a dict hit.
+    return LLM_SYSTEM_PROMPT_TEMPLATE.format(
+        customer_name=name,
+        loan_amount=loan,
+        monthly_debt=emi,
+        half_monthly_debt=half_emi,
+        credit_score_text=score,
+        unknown_customer_placeholder=UNKNOWN_CUSTOMER_PLACEHOLDER
+    )
+
+
 def generate_system_prompt(customer_info_dict):
     if customer_info_dict:
         name = customer_info_dict.get('Random_Name', UNKNOWN_CUSTOMER_PLACEHOLDER)
@@ -163,43 +334,184 @@ def generate_system_prompt(customer_info_dict):
         half_emi = 'N/A (details not yet available)'
         score = 'N/A (details not yet available)'
 
-    return LLM_SYSTEM_PROMPT_TEMPLATE.format(
-        customer_name=name,
-        loan_amount=loan,
-        monthly_debt=emi,
-        half_monthly_debt=half_emi,
-        credit_score_text=score,
-        unknown_customer_placeholder=UNKNOWN_CUSTOMER_PLACEHOLDER
-    )
+    return _render_prompt(name, loan, emi, half_emi, score)
+
+
+# --- Semantic response cache ---
+# Collections calls are full of near-duplicate user turns ("I can't pay",
+# "why are you calling", "ok"). Caching the (bot text, MP3) lets repeats skip
+# both the Gemini and the TTS round trip. Similarity is a bag-of-words cosine,
+# a dependency-free stand-in for a model embedding. Each CallState carries its
+# own LRU so a reply generated in one caller's conversation can never be
+# replayed to another — a module-global cache would pool every unidentified
+# caller in one bucket and replay identified customers across separate calls.
+SEMANTIC_CACHE_MAX_ENTRIES = 32
+SEMANTIC_CACHE_THRESHOLD = 0.92
+# The HTTP fallback and websocket threads can both touch a call's cache;
+# unsynchronized iteration vs. store raises "mutated during iteration".
+semantic_cache_lock = threading.Lock()
+
+_WORD_RE = re.compile(r"[a-z']+")
+
+
+def _transcript_vector(text):
+    counts = collections.Counter(_WORD_RE.findall(text.lower()))
+    norm = math.sqrt(sum(c * c for c in counts.values()))
+    return counts, norm
+
+
+def _cosine_similarity(vec_a, vec_b):
+    counts_a, norm_a = vec_a
+    counts_b, norm_b = vec_b
+    if not norm_a or not norm_b:
+        return 0.0
+    dot = sum(count * counts_b.get(word, 0) for word, count in counts_a.items())
+    return dot / (norm_a * norm_b)
+
+
+def semantic_cache_lookup(call_state, transcript):
+    query_vec = _transcript_vector(transcript)
+    with semantic_cache_lock:
+        cache = call_state.semantic_cache
+        best_key, best_score = None, 0.0
+        for key, (vec, _bot_text, _audio) in cache.items():
+            score = _cosine_similarity(query_vec, vec)
+            if score > best_score:
+                best_key, best_score = key, score
+        if best_key is not None and best_score >= SEMANTIC_CACHE_THRESHOLD:
+            cache.move_to_end(best_key)
+            _vec, bot_text, audio_bytes = cache[best_key]
+            logger.info(f"Semantic cache hit (score {best_score:.2f}) for transcript: '{transcript[:50]}'")
+            return bot_text, audio_bytes
+    return None
 
 
-async def call_gemini_model(system_prompt_text, conversation_history_for_llm):
-    if not gemini_configured:
+def semantic_cache_store(call_state, transcript, bot_text, audio_bytes):
+    key = " ".join(_WORD_RE.findall(transcript.lower()))
+    vector = _transcript_vector(transcript)
+    with semantic_cache_lock:
+        cache = call_state.semantic_cache
+        cache[key] = (vector, bot_text, audio_bytes)
+        cache.move_to_end(key)
+        while len(cache) > SEMANTIC_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+
+
+GEMINI_CACHE_TTL = datetime.timedelta(minutes=5)
+# Refresh the handle only when this close to expiry, so most turns skip the
+# update round trip entirely.
+GEMINI_CACHE_REFRESH_MARGIN_SECONDS = 60.0
+
+
+async def _get_or_create_gemini_cache(call_state, system_prompt_text):
+    """Get (or create) an explicit Gemini context cache for the system prompt.
+
+    The system prompt is identical on every turn of a call, so uploading it once
+    and referencing it by handle avoids re-sending ~800 tokens per request. The
+    expiry is tracked locally and the handle's TTL is bumped (in a thread, off
+    the event loop) only when it is about to lapse, so long calls never hand
+    Gemini an expired cache yet ordinary turns pay no extra round trip.
+    Returns None when caching is unavailable (e.g. the prompt is
+    below the API's minimum cacheable token count); that outcome is remembered
+    per prompt so failing turns don't retry the create on every request, and
+    callers fall back to passing system_instruction inline. The template keeps
+    its invariant persona block first so the inline path still benefits from
+    implicit prefix caching.
+    """
+    genai = get_genai()
+    if genai is None:
+        return None
+    if call_state.gemini_cache_prompt == system_prompt_text:
+        cached = call_state.gemini_cache
+        if cached is None:
+            # Caching already failed for this prompt; stay on the inline path.
+            return None
+        if time.monotonic() < call_state.gemini_cache_expiry - GEMINI_CACHE_REFRESH_MARGIN_SECONDS:
+            return cached
+        try:
+            await asyncio.to_thread(cached.update, ttl=GEMINI_CACHE_TTL)
+            call_state.gemini_cache_expiry = time.monotonic() + GEMINI_CACHE_TTL.total_seconds()
+            return cached
+        except Exception as e:
+            logger.warning(f"Gemini context cache refresh failed ({e}). Recreating.")
+            call_state.gemini_cache = None
+    try:
+        cached = await asyncio.to_thread(
+            genai.caching.CachedContent.create,
+            model=GEMINI_MODEL_NAME,
+            system_instruction=system_prompt_text,
+            ttl=GEMINI_CACHE_TTL
+        )
+        call_state.gemini_cache = cached
+        call_state.gemini_cache_prompt = system_prompt_text
+        call_state.gemini_cache_expiry = time.monotonic() + GEMINI_CACHE_TTL.total_seconds()
+        logger.info(f"Created Gemini context cache '{cached.name}' for current system prompt.")
+        return cached
+    except Exception as e:
+        logger.warning(f"Gemini context caching unavailable ({e}). Falling back to inline system_instruction.")
+        # Sticky per prompt: a None handle with a matching prompt means "don't
+        # retry", so the guaranteed-failing create isn't repeated every turn.
+        call_state.gemini_cache = None
+        call_state.gemini_cache_prompt = system_prompt_text
+        return None
+
+
+# Sentence boundary used to flush streamed LLM text into per-sentence TTS.
+_SENTENCE_END_RE = re.compile(r"[.!?][\"')\]]*\s")
+
+# Detects the bot asking for the caller's name, e.g. "could you tell me your
+# full name". One case-insensitive pass instead of lowercasing the response
+# and running several substring scans over it.
+NAME_ASK_RE = re.compile(
+    r"(?is)\bname\b.*?(what\s+is\s+your|could\s+you\s+tell\s+me|may\s+i\s+have)"
+    r"|(what\s+is\s+your|could\s+you\s+tell\s+me|may\s+i\s+have).*?\bname\b"
+)
+
+
+async def call_gemini_model(call_state, system_prompt_text, conversation_history_for_llm):
+    """Generate the bot's reply, overlapping TTS with the LLM stream.
+
+    Gemini is called with stream=True; each completed sentence is handed to
+    text_to_speech as soon as its boundary arrives, so synthesis runs while the
+    rest of the completion is still decoding. Returns (bot_response_text,
+    audio_bytes); audio_bytes is None when no speech was synthesized (mock and
+    error paths) and the caller should synthesize the text itself.
+    """
+    genai = get_genai()
+    if genai is None:
         logger.warning("Gemini client not configured. Using mock LLM response.")
         await asyncio.sleep(0.2)
-        if active_call_data["asked_for_name_in_last_turn"] and not active_call_data["customer_info"]:
+        if call_state.asked_for_name_in_last_turn and not call_state.customer_info:
             # This mock is if LLM asked for name, and user provides it in next turn.
             # For initial call, asked_for_name_in_last_turn is false or customer_info is known.
-            return "Thank you. My name is Mock User. What is this call regarding?"
+            return "Thank you. My name is Mock User. What is this call regarding?", None
         # If customer_info is known or it's the initial prompt:
-        if active_call_data.get("customer_info"):
-            return f"Hello {active_call_data['customer_info']['Random_Name']}, this is LoanMate from Global Finance Solutions. Your mock loan of $1000 is due. Can you pay?"
+        if call_state.customer_info:
+            return f"Hello {call_state.customer_info['Random_Name']}, this is LoanMate from Global Finance Solutions. Your mock loan of $1000 is due. Can you pay?", None
         else:  # No customer info, initial call, mock LLM should ask for name
-            return "Hello, this is LoanMate from Global Finance Solutions. Could you please tell me your full name so I can bring up your account details?"
+            return "Hello, this is LoanMate from Global Finance Solutions. Could you please tell me your full name so I can bring up your account details?", None
 
     try:
-        model = genai.GenerativeModel(
-            model_name=GEMINI_MODEL_NAME,
-            system_instruction=system_prompt_text,
-            generation_config={"temperature": 0.7}
-        )
+        cached_content = await _get_or_create_gemini_cache(call_state, system_prompt_text)
+        if cached_content is not None:
+            model = genai.GenerativeModel.from_cached_content(
+                cached_content=cached_content,
+                generation_config={"temperature": 0.7}
+            )
+        else:
+            model = genai.GenerativeModel(
+                model_name=GEMINI_MODEL_NAME,
+                system_instruction=system_prompt_text,
+                generation_config={"temperature": 0.7}
+            )
 
         logger.info(
             f"Sending to Gemini ({GEMINI_MODEL_NAME}). System prompt applied. History length: {len(conversation_history_for_llm)}")
 
         # *** FIX: Ensure 'contents' is not empty for the initial call ***
-        effective_contents_for_gemini = conversation_history_for_llm
-        if not conversation_history_for_llm:  # First turn from model, history is empty
+        # History lives in a deque; materialize a list only here at the call site.
+        effective_contents_for_gemini = list(conversation_history_for_llm)
+        if not effective_contents_for_gemini:  # First turn from model, history is empty
             # Provide a generic prompt to make the model start based on its system_instruction.
             # This prompt acts as the "current turn's input" that generate_content needs.
             effective_contents_for_gemini = "Please begin the conversation according to your system instructions."
@@ -208,15 +520,42 @@ async def call_gemini_model(system_prompt_text, conversation_history_for_llm):
 
         response = await asyncio.to_thread(
             model.generate_content,
-            contents=effective_contents_for_gemini
+            contents=effective_contents_for_gemini,
+            stream=True
         )
 
-        bot_response_text = ""
-        if response.parts:
-            bot_response_text = "".join(part.text for part in response.parts if hasattr(part, 'text'))
-        elif hasattr(response, 'text') and response.text:
-            bot_response_text = response.text
-        else:
+        # Iterate the blocking stream in a thread, flushing completed sentences
+        # into TTS tasks so synthesis overlaps the remaining decode.
+        text_parts = []
+        pending = ""
+        sentence_tasks = []
+        stream_iter = iter(response)
+        _stream_end = object()
+        while True:
+            chunk = await asyncio.to_thread(next, stream_iter, _stream_end)
+            if chunk is _stream_end:
+                break
+            chunk_text = ""
+            if chunk.parts:
+                chunk_text = "".join(part.text for part in chunk.parts if hasattr(part, 'text'))
+            elif hasattr(chunk, 'text') and chunk.text:
+                chunk_text = chunk.text
+            if not chunk_text:
+                continue
+            text_parts.append(chunk_text)
+            pending += chunk_text
+            while True:
+                boundary = _SENTENCE_END_RE.search(pending)
+                if not boundary:
+                    break
+                sentence, pending = pending[:boundary.end()].strip(), pending[boundary.end():]
+                if sentence:
+                    sentence_tasks.append(asyncio.create_task(text_to_speech(sentence)))
+        if pending.strip():
+            sentence_tasks.append(asyncio.create_task(text_to_speech(pending.strip())))
+
+        bot_response_text = "".join(text_parts).strip()
+        if not bot_response_text:
             logger.error(
                 f"Gemini response empty or blocked. Prompt_feedback: {response.prompt_feedback if hasattr(response, 'prompt_feedback') else 'N/A'}")
             block_reason_msg = ""
@@ -227,73 +566,236 @@ async def call_gemini_model(system_prompt_text, conversation_history_for_llm):
                 elif hasattr(response.prompt_feedback, 'block_reason') and response.prompt_feedback.block_reason:
                     block_reason_msg = f" Reason code: {response.prompt_feedback.block_reason}."
 
-            return f"My apologies, my response was prevented due to a content filter.{block_reason_msg} Could we try rephrasing or discussing a different aspect?"
-
-        bot_response_text = bot_response_text.strip()
-        if not bot_response_text:
+            if block_reason_msg:
+                return f"My apologies, my response was prevented due to a content filter.{block_reason_msg} Could we try rephrasing or discussing a different aspect?", None
             logger.warning("Gemini returned an empty string after stripping.")
-            return "I seem to be at a loss for words. Could you try that again?"
+            return "I seem to be at a loss for words. Could you try that again?", None
+
+        audio_bytes = None
+        if sentence_tasks:
+            try:
+                audio_chunks = await asyncio.gather(*sentence_tasks)
+                audio_bytes = b"".join(audio_chunks)
+            except Exception as tts_e:
+                logger.warning(f"Per-sentence TTS failed, deferring to full-text synthesis: {tts_e}")
+                for task in sentence_tasks:
+                    task.cancel()
+                audio_bytes = None
 
         logger.info(f"Gemini response: {bot_response_text}")
-        return bot_response_text
+        return bot_response_text, audio_bytes
 
     except Exception as e:
-        logger.error(f"Error calling Gemini API: {e}", exc_info=True)
-        return "I'm sorry, I'm having trouble connecting to my main system right now. Please try again in a moment."
+        logger.error(f"Error calling Gemini API: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
+        return "I'm sorry, I'm having trouble connecting to my main system right now. Please try again in a moment.", None
+
+
+# --- Exact-match TTS audio cache ---
+# LoanMate repeats fixed phrases constantly (fallback strings, greetings,
+# "Thank you"), so identical text never needs a second Aura round trip.
+TTS_CACHE_MAX_ENTRIES = 512
+tts_cache = collections.OrderedDict()
+# Shared by request threads, the websocket thread and the startup warm thread;
+# move_to_end racing popitem on the same key raises KeyError without this.
+tts_cache_lock = threading.Lock()
+
+
+def _synthesize_speech_blocking(text):
+    """Call Deepgram TTS over the shared keep-alive client (runs in a thread).
+
+    Streaming the response drains chunks as they come off the wire, avoiding
+    an extra full-response buffer.
+    """
+    with dg_http.stream(
+        "POST",
+        f"{DEEPGRAM_API_BASE}/speak",
+        params={"model": "aura-asteria-en", "encoding": "mp3"},
+        json={"text": text},
+    ) as response_obj:
+        response_obj.raise_for_status()
+        return b"".join(response_obj.iter_bytes(chunk_size=4096))
 
 
 async def text_to_speech(text):
     if not text:
         logger.error("TTS received empty text.")
-        text = "I encountered an internal error and cannot respond right now."
+        text = INTERNAL_ERROR_TEXT
 
-    speak_options = SpeakOptions(model="aura-asteria-en", encoding="mp3")
-    source = {"text": text}
+    cache_key = hashlib.sha1(text.encode()).digest()
+    with tts_cache_lock:
+        cached_audio = tts_cache.get(cache_key)
+        if cached_audio is not None:
+            tts_cache.move_to_end(cache_key)
+    if cached_audio is not None:
+        logger.info(f"TTS cache hit for: '{text[:50]}...'")
+        return cached_audio
 
     try:
-        response_obj: SpeakResponse = await asyncio.to_thread(
-            dg_client.speak.rest.v("1").stream_memory,
-            source,
-            speak_options
-        )
-        if response_obj and hasattr(response_obj, 'stream') and response_obj.stream:
-            audio_bytes = response_obj.stream.read()
-            if not audio_bytes:
-                logger.error("TTS generated empty audio bytes from stream_memory.")
-                raise ValueError("TTS generated empty audio.")
-            logger.info(f"TTS generated for: '{text[:50]}...', byte length: {len(audio_bytes)}")
-            return audio_bytes
-        else:
-            logger.error(
-                f"Deepgram TTS stream_memory did not return a valid response object or stream. Type: {type(response_obj)}")
-            raise ValueError("Invalid response from TTS stream_memory.")
+        audio_bytes = await asyncio.to_thread(_synthesize_speech_blocking, text)
+        if not audio_bytes:
+            logger.error("TTS generated empty audio bytes from stream.")
+            raise ValueError("TTS generated empty audio.")
+        logger.info(f"TTS generated for: '{text[:50]}...', byte length: {len(audio_bytes)}")
+        with tts_cache_lock:
+            tts_cache[cache_key] = audio_bytes
+            while len(tts_cache) > TTS_CACHE_MAX_ENTRIES:
+                tts_cache.popitem(last=False)
+        return audio_bytes
     except Exception as e:
-        logger.error(f"Error in Deepgram TTS: {e}", exc_info=True)
-        fallback_text = "I'm having trouble speaking at the moment. Please try again later."
-        source_fallback = {"text": fallback_text}
+        logger.warning(f"Deepgram TTS failed, trying fallback phrase: {e}")
         try:
-            response_fallback_obj: SpeakResponse = await asyncio.to_thread(
-                dg_client.speak.rest.v("1").stream_memory,
-                source_fallback,
-                speak_options
-            )
-            if response_fallback_obj and hasattr(response_fallback_obj, 'stream') and response_fallback_obj.stream:
-                audio_bytes_fallback = response_fallback_obj.stream.read()
-                if audio_bytes_fallback:
-                    return audio_bytes_fallback
+            audio_bytes_fallback = await asyncio.to_thread(
+                _synthesize_speech_blocking, SPEECH_ERROR_TEXT)
+            if audio_bytes_fallback:
+                return audio_bytes_fallback
             raise ValueError("Fallback TTS also failed.")
         except Exception as fallback_e:
-            logger.error(f"Fallback TTS also failed: {fallback_e}", exc_info=True)
+            logger.error(f"Fallback TTS also failed: {fallback_e}", exc_info=logger.isEnabledFor(logging.DEBUG))
             raise
 
 
+# Short acknowledgements the system prompt encourages the LLM to use. They are
+# synthesized while STT is still in flight so that if the reply opens with (or
+# is) one of them, the audio is already cached.
+PRECOMPUTED_FILLERS = (
+    "I see.",
+    "Hmm, I understand.",
+    "Okay.",
+    "Thank you.",
+)
+
+DIDNT_CATCH_TEXT = "I'm sorry, I didn't catch that. Could you please repeat?"
+GENERIC_ERROR_TEXT = "I've encountered an unexpected problem. Please try your request again later."
+SPEECH_ERROR_TEXT = "I'm having trouble speaking at the moment. Please try again later."
+INTERNAL_ERROR_TEXT = "I encountered an internal error and cannot respond right now."
+
+TTS_PREWARM_TEXTS = (
+    DIDNT_CATCH_TEXT,
+    GENERIC_ERROR_TEXT,
+    SPEECH_ERROR_TEXT,
+    INTERNAL_ERROR_TEXT,
+)
+
+# Pre-rendered MP3s for the fixed fallback phrases. Served straight from disk
+# so the error paths never touch Deepgram at all — even on a cold restart or
+# when the TTS service itself is down.
+STATIC_AUDIO_DIR = os.path.join('static', 'audio')
+FALLBACK_AUDIO_FILES = {
+    DIDNT_CATCH_TEXT: 'didnt_catch.mp3',
+    GENERIC_ERROR_TEXT: 'generic_error.mp3',
+    SPEECH_ERROR_TEXT: 'speech_error.mp3',
+    INTERNAL_ERROR_TEXT: 'internal_error.mp3',
+}
+
+
+def fallback_audio_path(text):
+    """Path of the pre-rendered MP3 for a fixed phrase, or None if absent."""
+    filename = FALLBACK_AUDIO_FILES.get(text)
+    if filename:
+        path = os.path.join(STATIC_AUDIO_DIR, filename)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def fallback_audio_bytes(text):
+    path = fallback_audio_path(text)
+    if path:
+        with open(path, 'rb') as audio_file:
+            return audio_file.read()
+    return None
+
+
+def warm_tts_cache():
+    """Make sure every fixed fallback phrase has zero-latency audio.
+
+    Previously rendered MP3s are loaded from static/audio into the TTS cache;
+    anything missing is synthesized once and persisted there so the next
+    restart doesn't need Deepgram either.
+    """
+    os.makedirs(STATIC_AUDIO_DIR, exist_ok=True)
+
+    async def _warm():
+        for prewarm_text in TTS_PREWARM_TEXTS:
+            prerendered = fallback_audio_bytes(prewarm_text)
+            if prerendered:
+                with tts_cache_lock:
+                    tts_cache[hashlib.sha1(prewarm_text.encode()).digest()] = prerendered
+                continue
+            try:
+                audio_bytes = await text_to_speech(prewarm_text)
+            except Exception as e:
+                logger.warning(f"TTS cache pre-warm failed for '{prewarm_text[:40]}...': {e}")
+                continue
+            filename = FALLBACK_AUDIO_FILES.get(prewarm_text)
+            if filename:
+                with open(os.path.join(STATIC_AUDIO_DIR, filename), 'wb') as audio_file:
+                    audio_file.write(audio_bytes)
+    try:
+        asyncio.run(_warm())
+        logger.info(f"TTS cache pre-warmed with {len(tts_cache)} fallback phrases.")
+    except Exception as e:
+        logger.warning(f"TTS cache pre-warm skipped: {e}")
+
+
+warm_tts_cache()
+
+
+async def respond_to_transcript(call_state, transcript):
+    """Run the post-STT turn pipeline: name resolution, LLM, TTS, caching.
+
+    Shared by the HTTP upload route and the live websocket path. Returns
+    (bot_response_text, audio_bytes).
+    """
+    call_state.conversation_history.append({"role": "user", "parts": [{"text": transcript}]})
+
+    # Name-collection turns carry a unique utterance (the caller's name), so
+    # they are excluded from the semantic cache below.
+    was_name_turn = call_state.asked_for_name_in_last_turn
+
+    if call_state.asked_for_name_in_last_turn and not call_state.customer_info:
+        potential_name = transcript.strip()
+        customer_details = get_customer_details(potential_name)
+        if customer_details:
+            call_state.customer_info = customer_details
+            # customer_info changed, so the cached rendered prompt is stale.
+            call_state.system_prompt = None
+            logger.info(
+                f"Customer identified from transcript: {potential_name} -> {customer_details['Random_Name']}")
+        else:
+            logger.info(f"Name '{potential_name}' from transcript not found. LLM will continue conversation.")
+        call_state.asked_for_name_in_last_turn = False
+
+    if call_state.system_prompt is None:
+        call_state.system_prompt = generate_system_prompt(call_state.customer_info)
+    system_prompt = call_state.system_prompt
+
+    cached_turn = None if was_name_turn else semantic_cache_lookup(call_state, transcript)
+    if cached_turn is not None:
+        bot_response_text, audio_bytes = cached_turn
+    else:
+        bot_response_text, audio_bytes = await call_gemini_model(
+            call_state, system_prompt, call_state.conversation_history)
+
+    # After LLM response, re-check if it might be asking for name again if still unknown
+    if not call_state.customer_info and UNKNOWN_CUSTOMER_PLACEHOLDER in system_prompt:
+        if NAME_ASK_RE.search(bot_response_text) is not None:
+            call_state.asked_for_name_in_last_turn = True
+            logger.info("LLM response seems to be asking for name again, setting asked_for_name_in_last_turn=True")
+
+    call_state.conversation_history.append({"role": "model", "parts": [{"text": bot_response_text}]})
+
+    if audio_bytes is None:
+        audio_bytes = await text_to_speech(bot_response_text)
+    if cached_turn is None and not was_name_turn:
+        semantic_cache_store(call_state, transcript, bot_response_text, audio_bytes)
+    return bot_response_text, audio_bytes
+
+
 # --- Flask Routes ---
 @app.route('/')
 def index():
-    active_call_data["customer_info"] = None
-    active_call_data["conversation_history"] = []
-    active_call_data["asked_for_name_in_last_turn"] = False
-    logger.info("Index page loaded, call state reset.")
+    logger.info("Index page loaded.")
     return render_template('index.html')
 
 
@@ -302,122 +804,240 @@ async def initiate_call_route():
     data = request.get_json()
     customer_name_input = data.get('customerName', '').strip()
 
-    active_call_data["conversation_history"] = []
-    active_call_data["customer_info"] = None
-    active_call_data["asked_for_name_in_last_turn"] = False
+    call_id, call_state = create_call_state()
 
     if customer_name_input:
         customer_details = get_customer_details(customer_name_input)
         if customer_details:
-            active_call_data["customer_info"] = customer_details
+            call_state.customer_info = customer_details
             logger.info(f"Customer '{customer_name_input}' found. Details: {customer_details}")
         else:
             logger.info(f"Customer '{customer_name_input}' provided but not found in CSV.")
             # customer_info remains None, system prompt will guide LLM to ask.
             pass
 
-    system_prompt = generate_system_prompt(active_call_data["customer_info"])
+    # Render once per call and reuse on subsequent turns until customer_info changes.
+    system_prompt = generate_system_prompt(call_state.customer_info)
+    call_state.system_prompt = system_prompt
 
     # Initial bot message (LLM generates greeting or asks for name)
     # Conversation history is empty here, call_gemini_model will handle it.
-    bot_response_text = await call_gemini_model(system_prompt, active_call_data["conversation_history"])
+    bot_response_text, audio_bytes = await call_gemini_model(
+        call_state, system_prompt, call_state.conversation_history)
 
     # Heuristic to set if LLM was prompted to ask for a name and did so.
     # Check if customer_info is still None AND the system prompt indicated it was unknown
-    if not active_call_data["customer_info"] and UNKNOWN_CUSTOMER_PLACEHOLDER in system_prompt:
+    if not call_state.customer_info and UNKNOWN_CUSTOMER_PLACEHOLDER in system_prompt:
         # A more robust check would be to analyze bot_response_text for name-asking phrases.
         # For now, assume if customer unknown and prompt was for unknown, LLM likely asked.
-        active_call_data["asked_for_name_in_last_turn"] = True
+        call_state.asked_for_name_in_last_turn = True
         logger.info("Initial call, customer unknown, setting asked_for_name_in_last_turn=True")
 
-    active_call_data["conversation_history"].append({"role": "model", "parts": [{"text": bot_response_text}]})
+    call_state.conversation_history.append({"role": "model", "parts": [{"text": bot_response_text}]})
 
     try:
-        audio_bytes = await text_to_speech(bot_response_text)
-        return send_file(io.BytesIO(audio_bytes), mimetype="audio/mpeg", as_attachment=False,
-                         download_name="response.mp3")
+        if audio_bytes is None:
+            audio_bytes = await text_to_speech(bot_response_text)
+        response = Response(audio_bytes, mimetype="audio/mpeg")
+        # The client echoes this id back on /process_audio and /ws/audio.
+        response.headers['X-Call-Id'] = call_id
+        return response
     except Exception as e:
-        logger.error(f"TTS error during /initiate_call: {e}", exc_info=True)
+        logger.error(f"TTS error during /initiate_call: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
         return jsonify({"error": "TTS Error", "details": str(e)}), 500
 
 
+def _transcribe_stream_blocking(stream, params):
+    """Post an audio stream to Deepgram STT over the shared client (runs in a thread).
+
+    The body is a generator over the upload's spooled temp file, so httpx
+    chunk-uploads it instead of materializing the whole clip in the heap.
+    Returns the parsed response JSON.
+    """
+    def _chunks():
+        while True:
+            chunk = stream.read(65536)
+            if not chunk:
+                return
+            yield chunk
+
+    response = dg_http.post(
+        f"{DEEPGRAM_API_BASE}/listen",
+        params=params,
+        content=_chunks(),
+        headers={"Content-Type": "application/octet-stream"},
+    )
+    response.raise_for_status()
+    return response.json()
+
+
 @app.route('/process_audio', methods=['POST'])
 async def process_audio_route():
     if 'audio_data' not in request.files:
         logger.warning("No audio data in request.")
         return jsonify({"error": "No audio data"}), 400
 
+    call_state = get_call_state(request.form.get('call_id'))
+    if call_state is None:
+        logger.warning("Unknown or expired call_id in /process_audio.")
+        return jsonify({"error": "Unknown or expired call. Please start a new call."}), 400
+
     audio_file = request.files['audio_data']
+    filler_tasks = []
 
     try:
-        buffer_data = audio_file.read()
-        payload: FileSource = {"buffer": buffer_data}
-        options = PrerecordedOptions(model="nova-2", smart_format=True, language="en-US")
+        # Pre-synthesize common fillers in the background so they're cached
+        # for later turns; never awaited inside the turn itself.
+        with tts_cache_lock:
+            uncached_fillers = [
+                filler for filler in PRECOMPUTED_FILLERS
+                if hashlib.sha1(filler.encode()).digest() not in tts_cache
+            ]
+        filler_tasks = [
+            asyncio.create_task(text_to_speech(filler))
+            for filler in uncached_fillers
+        ]
+
+        # Name-collection turns are a short spoken name; smart_format's
+        # server-side punctuation/number pass (~100-200ms) buys nothing there.
+        stt_params = {
+            "model": "nova-2",
+            "smart_format": not call_state.asked_for_name_in_last_turn,
+            "language": "en-US",
+        }
 
         logger.info("Sending audio to Deepgram STT...")
-        response_stt_obj: PrerecordedResponse = await asyncio.to_thread(
-            dg_client.listen.rest.v("1").transcribe_file,
-            payload,
-            options
+        response_stt = await asyncio.to_thread(
+            _transcribe_stream_blocking,
+            audio_file.stream,
+            stt_params
         )
 
         transcript = ""
-        if response_stt_obj.results and response_stt_obj.results.channels and response_stt_obj.results.channels[
-            0].alternatives:
-            transcript = response_stt_obj.results.channels[0].alternatives[0].transcript
+        try:
+            transcript = response_stt["results"]["channels"][0]["alternatives"][0]["transcript"]
+        except (KeyError, IndexError, TypeError):
+            pass
 
         if not transcript:
             logger.warning("STT returned empty transcript.")
-            audio_bytes = await text_to_speech("I'm sorry, I didn't catch that. Could you please repeat?")
-            return send_file(io.BytesIO(audio_bytes), mimetype="audio/mpeg", as_attachment=False,
-                             download_name="response.mp3")
+            static_path = fallback_audio_path(DIDNT_CATCH_TEXT)
+            if static_path:
+                return send_file(static_path, mimetype="audio/mpeg")
+            audio_bytes = await text_to_speech(DIDNT_CATCH_TEXT)
+            return Response(audio_bytes, mimetype="audio/mpeg")
 
         logger.info(f"Deepgram STT transcript: {transcript}")
-        active_call_data["conversation_history"].append({"role": "user", "parts": [{"text": transcript}]})
-
-        if active_call_data["asked_for_name_in_last_turn"] and not active_call_data["customer_info"]:
-            potential_name = transcript.strip()
-            customer_details = get_customer_details(potential_name)
-            if customer_details:
-                active_call_data["customer_info"] = customer_details
-                logger.info(
-                    f"Customer identified from transcript: {potential_name} -> {customer_details['Random_Name']}")
-            else:
-                logger.info(f"Name '{potential_name}' from transcript not found. LLM will continue conversation.")
-            active_call_data["asked_for_name_in_last_turn"] = False
-
-        system_prompt = generate_system_prompt(active_call_data["customer_info"])
-        bot_response_text = await call_gemini_model(system_prompt, active_call_data["conversation_history"])
-
-        # After LLM response, re-check if it might be asking for name again if still unknown
-        if not active_call_data["customer_info"] and UNKNOWN_CUSTOMER_PLACEHOLDER in system_prompt:
-            # This is a simple heuristic. A better way is to check bot_response_text for name-asking patterns.
-            if "name" in bot_response_text.lower() and (
-                    "what is your" in bot_response_text.lower() or "could you tell me" in bot_response_text.lower()):
-                active_call_data["asked_for_name_in_last_turn"] = True
-                logger.info("LLM response seems to be asking for name again, setting asked_for_name_in_last_turn=True")
-
-        active_call_data["conversation_history"].append({"role": "model", "parts": [{"text": bot_response_text}]})
-
-        MAX_HISTORY_TURNS = 10
-        if len(active_call_data["conversation_history"]) > MAX_HISTORY_TURNS * 2:
-            active_call_data["conversation_history"] = active_call_data["conversation_history"][
-                                                       -(MAX_HISTORY_TURNS * 2):]
-            logger.info(f"Conversation history trimmed to last {MAX_HISTORY_TURNS} turns.")
-
-        audio_bytes = await text_to_speech(bot_response_text)
-        return send_file(io.BytesIO(audio_bytes), mimetype="audio/mpeg", as_attachment=False,
-                         download_name="response.mp3")
+        bot_response_text, audio_bytes = await respond_to_transcript(call_state, transcript)
+        return Response(audio_bytes, mimetype="audio/mpeg")
 
     except Exception as e:
-        logger.error(f"Error in /process_audio: {e}", exc_info=True)
+        logger.error(f"Error in /process_audio: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
         try:
-            error_audio_bytes = await text_to_speech(
-                "I've encountered an unexpected problem. Please try your request again later.")
-            return send_file(io.BytesIO(error_audio_bytes), mimetype="audio/mpeg", status=500)
+            error_audio_bytes = fallback_audio_bytes(GENERIC_ERROR_TEXT)
+            if error_audio_bytes is None:
+                error_audio_bytes = await text_to_speech(GENERIC_ERROR_TEXT)
+            return Response(error_audio_bytes, mimetype="audio/mpeg", status=500)
         except Exception as tts_e:
-            logger.error(f"TTS failed for error message as well: {tts_e}", exc_info=True)
+            logger.error(f"TTS failed for error message as well: {tts_e}", exc_info=logger.isEnabledFor(logging.DEBUG))
             return jsonify({"error": "Critical System Error", "details": str(e)}), 500
+    finally:
+        # Settle the warm-up tasks after the response is ready so they don't
+        # get cancelled when the view's event loop closes.
+        if filler_tasks:
+            await asyncio.gather(*filler_tasks, return_exceptions=True)
+
+
+@sock.route('/ws/audio')
+def audio_ws(ws):
+    """Live STT over a websocket — the low-latency alternative to /process_audio.
+
+    The browser forwards recorder chunks as they are produced instead of
+    uploading the full clip after the user stops speaking. Chunks are relayed
+    to Deepgram's live API with interim_results, so transcription runs while
+    the user is still talking; a "Finalize" text message from the client flushes
+    Deepgram's buffer and the turn pipeline starts immediately on the final
+    transcript. The reply MP3 is sent back as one binary message.
+    /process_audio remains as the fallback for clients that cannot stream.
+
+    The client's first text frame must be "CallId <id>" with the id issued by
+    /initiate_call, so turns run against the right per-call state.
+    """
+    call_state = None
+    dg_connection = dg_client.listen.websocket.v("1")
+    final_parts = []
+    utterance_done = threading.Event()
+
+    def on_transcript(client, result, **kwargs):
+        try:
+            alternative = result.channel.alternatives[0]
+            if result.is_final and alternative.transcript:
+                final_parts.append(alternative.transcript)
+            # Only the finalize() flush marks the utterance complete; a
+            # speech_final from a mid-recording pause would cut off the tail.
+            if getattr(result, "from_finalize", False):
+                utterance_done.set()
+        except Exception as e:
+            logger.warning(f"Error handling live transcript event: {e}")
+
+    dg_connection.on(LiveTranscriptionEvents.Transcript, on_transcript)
+    live_options = LiveOptions(
+        model="nova-2",
+        language="en-US",
+        smart_format=True,
+        interim_results=True,
+        endpointing=300
+    )
+    if not dg_connection.start(live_options):
+        logger.error("Failed to open Deepgram live connection for /ws/audio.")
+        return
+
+    try:
+        while True:
+            message = ws.receive(timeout=60)
+            if message is None:
+                break
+            if isinstance(message, (bytes, bytearray)):
+                dg_connection.send(bytes(message))
+                continue
+
+            # Text frames are control messages.
+            if message.startswith("CallId "):
+                call_state = get_call_state(message[len("CallId "):].strip())
+                if call_state is None:
+                    logger.warning("Unknown or expired call_id on /ws/audio; closing.")
+                    break
+                continue
+
+            if message == "Finalize":
+                utterance_done.clear()
+                dg_connection.finalize()
+                utterance_done.wait(timeout=3.0)
+                transcript = " ".join(final_parts).strip()
+                final_parts.clear()
+
+                if call_state is None:
+                    logger.warning("Finalize received on /ws/audio before a CallId; closing.")
+                    break
+                if not transcript:
+                    logger.warning("Live STT produced empty transcript.")
+                    audio_bytes = fallback_audio_bytes(DIDNT_CATCH_TEXT)
+                    if audio_bytes is None:
+                        audio_bytes = asyncio.run(text_to_speech(DIDNT_CATCH_TEXT))
+                else:
+                    logger.info(f"Deepgram live STT transcript: {transcript}")
+                    _bot_response_text, audio_bytes = asyncio.run(respond_to_transcript(call_state, transcript))
+                ws.send(audio_bytes)
+    except ConnectionClosed:
+        # The browser closes the socket after each turn; nothing went wrong.
+        pass
+    except Exception as e:
+        logger.error(f"Error in /ws/audio: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
+    finally:
+        try:
+            dg_connection.finish()
+        except Exception:
+            pass
 
 
 if __name__ == '__main__':
@@ -11,6 +11,9 @@ document.addEventListener('DOMContentLoaded', () => {
     let audioChunks = [];
     let isRecording = false;
     let callActive = false;
+    let socket = null; // streaming STT websocket for the current recording
+    let callId = null; // per-call session id issued by /initiate_call
+    let pendingAudioBlob = null; // finalized clip awaiting a websocket reply
 
     function addLogMessage(speaker, message) {
         const messageElement = document.createElement('p');
@@ -69,6 +72,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 throw new Error(errorData.error || `HTTP error! status: ${response.status}`);
             }
 
+            callId = response.headers.get('X-Call-Id');
             const audioBlob = await response.blob();
             // The server's response to /initiate_call already contains the first bot message's audio.
             // We need to get the text of this first message to log it.
@@ -88,6 +92,80 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
+    // Opens the live STT websocket. Resolves with the socket, or null if the
+    // connection fails (in which case we fall back to the HTTP upload path).
+    function openStreamingSocket() {
+        return new Promise((resolve) => {
+            const wsProtocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+            const ws = new WebSocket(`${wsProtocol}://${window.location.host}/ws/audio`);
+            ws.binaryType = 'blob';
+            ws.onopen = () => resolve(ws);
+            ws.onerror = () => resolve(null);
+            ws.onmessage = async (event) => {
+                // Single binary message: the bot's reply MP3.
+                pendingAudioBlob = null;
+                ws.close();
+                socket = null;
+                await playBotAudio(event.data);
+            };
+            ws.onclose = async () => {
+                if (socket !== ws) return; // reply already handled
+                socket = null;
+                if (pendingAudioBlob) {
+                    // The server closed after Finalize without replying.
+                    // The clip is buffered locally, so retry over HTTP.
+                    const audioBlob = pendingAudioBlob;
+                    pendingAudioBlob = null;
+                    await sendViaHttp(audioBlob);
+                } else if (callActive && !isRecording) {
+                    statusMessage.textContent = "Connection lost. Your turn to speak.";
+                    recordButton.disabled = false;
+                }
+            };
+        });
+    }
+
+    // HTTP fallback: upload the complete recording to /process_audio.
+    async function sendViaHttp(audioBlob) {
+        const formData = new FormData();
+        formData.append('audio_data', audioBlob, 'user_audio.webm');
+        formData.append('call_id', callId);
+
+        try {
+            const response = await fetch('/process_audio', {
+                method: 'POST',
+                body: formData
+            });
+            if (!response.ok) {
+                 const errorData = await response.json();
+                 throw new Error(errorData.error || `HTTP error! status: ${response.status}`);
+            }
+            const newAudioBlob = await response.blob();
+            // The text transcript would ideally come from a JSON response along with audio.
+            // For now, the backend directly sends audio. We need to get the transcript.
+            // This requires the backend to also send the transcript.
+            // Let's assume for now we don't log the user's exact transcript until backend is modified.
+            // addLogMessage("You", "Your spoken response (transcript needed from backend)");
+            // The backend also needs to send the bot's *text* response for logging.
+            // addLogMessage("Bot", "Bot's next textual response (needed from backend)");
+            await playBotAudio(newAudioBlob);
+
+            // If the bot's response indicates the end of the call, update callActive
+            // This logic needs to be more robust, perhaps by backend sending a 'call_ended' flag
+            // For now, a simple check:
+            // if (bot response implies end) callActive = false;
+            // Example: if (bot_response_text.includes("Have a good day.") || bot_response_text.includes("call ended")) {
+            //    callActive = false;
+            // }
+
+        } catch (error) {
+            console.error('Error processing audio:', error);
+            addLogMessage("System", `Error: ${error.message}`);
+            statusMessage.textContent = "Error processing your response.";
+            recordButton.disabled = false; // Re-enable on error
+        }
+    }
+
     async function startRecording() {
         if (!callActive) {
             statusMessage.textContent = "Please start the call first.";
@@ -99,9 +177,19 @@ document.addEventListener('DOMContentLoaded', () => {
             const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
             mediaRecorder = new MediaRecorder(stream);
             audioChunks = [];
+            socket = await openStreamingSocket();
+            if (socket) {
+                // Bind this socket to the call's server-side state.
+                socket.send('CallId ' + callId);
+            }
 
             mediaRecorder.ondataavailable = event => {
+                // Always buffer locally so the HTTP fallback has the full clip
+                // if the websocket drops mid-recording.
                 audioChunks.push(event.data);
+                if (socket && socket.readyState === WebSocket.OPEN) {
+                    socket.send(event.data);
+                }
             };
 
             mediaRecorder.onstop = async () => {
@@ -114,46 +202,20 @@ document.addEventListener('DOMContentLoaded', () => {
                 const audioBlob = new Blob(audioChunks, { type: 'audio/webm' }); // or 'audio/ogg', 'audio/wav'
                 audioChunks = []; // Reset for next recording
 
-                const formData = new FormData();
-                formData.append('audio_data', audioBlob, 'user_audio.webm');
-
-                try {
-                    const response = await fetch('/process_audio', {
-                        method: 'POST',
-                        body: formData
-                    });
-                    if (!response.ok) {
-                         const errorData = await response.json();
-                         throw new Error(errorData.error || `HTTP error! status: ${response.status}`);
-                    }
-                    const newAudioBlob = await response.blob();
-                    // The text transcript would ideally come from a JSON response along with audio.
-                    // For now, the backend directly sends audio. We need to get the transcript.
-                    // This requires the backend to also send the transcript.
-                    // Let's assume for now we don't log the user's exact transcript until backend is modified.
-                    // addLogMessage("You", "Your spoken response (transcript needed from backend)");
-                    // The backend also needs to send the bot's *text* response for logging.
-                    // addLogMessage("Bot", "Bot's next textual response (needed from backend)");
-                    await playBotAudio(newAudioBlob);
-
-                    // If the bot's response indicates the end of the call, update callActive
-                    // This logic needs to be more robust, perhaps by backend sending a 'call_ended' flag
-                    // For now, a simple check:
-                    // if (bot response implies end) callActive = false;
-                    // Example: if (bot_response_text.includes("Have a good day.") || bot_response_text.includes("call ended")) {
-                    //    callActive = false;
-                    // }
-
-
-                } catch (error) {
-                    console.error('Error processing audio:', error);
-                    addLogMessage("System", `Error: ${error.message}`);
-                    statusMessage.textContent = "Error processing your response.";
-                    recordButton.disabled = false; // Re-enable on error
+                if (socket && socket.readyState === WebSocket.OPEN) {
+                    // Deepgram has already seen the audio; just flush the
+                    // utterance. The reply arrives via socket.onmessage, and
+                    // socket.onclose falls back to HTTP if the turn dies first.
+                    pendingAudioBlob = audioBlob;
+                    socket.send('Finalize');
+                } else {
+                    socket = null;
+                    await sendViaHttp(audioBlob);
                 }
             };
 
-            mediaRecorder.start();
+            // Small timeslice so chunks stream to the server while recording.
+            mediaRecorder.start(250);
             isRecording = true;
             recordButton.textContent = "Stop Recording";
             recordButton.classList.add('recording');